@@ -2,21 +2,656 @@
 """
 Parallel Tally Center (PTC) System - Installation Setup
 A comprehensive election management system installer with GUI
+
+Run without arguments for the graphical wizard, or with
+"--cli [settings.json]" for an unattended installation.
 """
 
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-import subprocess
 import sys
 import os
-import json
+import collections
+import contextlib
+import functools
 import platform
+import queue
+import secrets
 import threading
 import time
-import zipfile
-import shutil
+from dataclasses import dataclass, fields
 from pathlib import Path
 
+# tkinter is only imported by run_gui(), so --cli runs work on headless
+# systems and never pay for loading Tk
+tk = ttk = messagebox = filedialog = None
+
+# Host details, looked up once per process
+_SYSTEM = platform.system()
+_RELEASE = platform.release()
+_DEFAULT_INSTALL = os.path.expanduser("~/ptc-system")
+
+# Application sources ship alongside the installer directory
+SOURCE_DIR = Path(__file__).resolve().parent.parent
+
+# Packaged application archive; when present it is extracted instead of
+# copying SOURCE_DIR
+APP_BUNDLE = Path(__file__).resolve().parent / "ptc-app.zip"
+
+# Entries under SOURCE_DIR that the application needs at build and run time;
+# nothing else (local .env, cookies, uploads, editor state) is copied
+COPY_INCLUDE = (
+    "client", "server", "shared", "attached_assets",
+    "package.json", "package-lock.json", "tsconfig.json", "components.json",
+    "drizzle.config.ts", "vite.config.ts", "tailwind.config.ts", "postcss.config.js",
+)
+
+# Names skipped at any depth inside the included directories
+COPY_IGNORE = ("node_modules", "__pycache__")
+
+# Oldest supported major versions of the system dependencies
+MIN_NODE_MAJOR = 18
+MIN_POSTGRESQL_MAJOR = 13
+LOCAL_DB_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+# Package manager commands used to provision system dependencies. The index
+# refresh runs before each install; commands in PRIVILEGED_SYSTEMS need root
+PACKAGE_INDEX_UPDATE_COMMANDS = {
+    "Linux": ["apt-get", "update"],
+}
+NODEJS_INSTALL_COMMANDS = {
+    "Linux": ["apt-get", "install", "-y", "nodejs", "npm"],
+    "Darwin": ["brew", "install", "node"],
+    "Windows": ["winget", "install", "-e", "--id", "OpenJS.NodeJS.LTS"],
+}
+POSTGRESQL_INSTALL_COMMANDS = {
+    "Linux": ["apt-get", "install", "-y", "postgresql", "postgresql-client"],
+    "Darwin": ["brew", "install", "postgresql@15"],
+    "Windows": ["winget", "install", "-e", "--id", "PostgreSQL.PostgreSQL.15"],
+}
+PRIVILEGED_SYSTEMS = ("Linux",)
+
+def _mount_point(path):
+    """Return the mount point holding path, which need not exist yet"""
+    path = os.path.realpath(path)
+    while not os.path.exists(path):
+        path = os.path.dirname(path)
+    while not os.path.ismount(path):
+        path = os.path.dirname(path)
+    return path
+
+def _scan_tree(root, ignore=COPY_IGNORE):
+    """Walk root once with os.scandir, returning its (directories, files) as relative paths"""
+    dirs, files = [], []
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        with os.scandir(os.path.join(root, rel)) as entries:
+            for entry in entries:
+                if entry.name in ignore:
+                    continue
+                path = os.path.join(rel, entry.name)
+                if entry.is_dir():
+                    dirs.append(path)
+                    stack.append(path)
+                else:
+                    files.append(path)
+    return dirs, files
+
+def _copy_file(src, dst):
+    """Copy a file's contents and permission bits on the kernel's fastest path
+    
+    Where os.copy_file_range exists (Linux) the data never passes through
+    Python: read-ahead is hinted as sequential first, and the source's pages
+    are dropped from the page cache afterwards. Elsewhere, or if the
+    filesystem refuses copy_file_range, shutil.copyfile (sendfile/fcopyfile)
+    is used instead.
+    """
+    import shutil
+    
+    copied = False
+    if hasattr(os, "copy_file_range"):
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+            try:
+                os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                remaining = os.fstat(src_fd).st_size
+                while remaining > 0:
+                    count = os.copy_file_range(src_fd, dst_fd, remaining)
+                    if count == 0:
+                        break
+                    remaining -= count
+                # A short copy (e.g. the file shrank) falls back to copyfile
+                copied = remaining == 0
+            except OSError:
+                pass
+            finally:
+                with contextlib.suppress(OSError):
+                    os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    if not copied:
+        shutil.copyfile(src, dst)
+    shutil.copymode(src, dst)
+
+def _extract_bundle(bundle, dst, check_cancelled=lambda: None):
+    """Extract a zip archive into dst, decompressing members on a thread pool
+    
+    ZipFile objects must not be shared between threads, so each worker opens
+    its own handle on the archive. All directories are created up front so
+    workers never race on mkdir. check_cancelled is called before each member
+    and may raise to abort. Returns the number of files extracted.
+    """
+    import zipfile
+    from concurrent.futures import ThreadPoolExecutor
+    
+    with zipfile.ZipFile(bundle) as archive:
+        infos = archive.infolist()
+    for info in infos:
+        if Path(info.filename).is_absolute() or ".." in Path(info.filename).parts:
+            raise Exception(f"Refusing to extract unsafe path from {bundle}: {info.filename}")
+            
+    members = [info for info in infos if not info.is_dir()]
+    dirs = {os.path.dirname(info.filename) for info in members}
+    dirs.update(info.filename.rstrip("/") for info in infos if info.is_dir())
+    for rel in sorted(d for d in dirs if d):
+        (dst / rel).mkdir(parents=True, exist_ok=True)
+        
+    local = threading.local()
+    handles = []
+    
+    def extract(info):
+        check_cancelled()
+        archive = getattr(local, "archive", None)
+        if archive is None:
+            archive = local.archive = zipfile.ZipFile(bundle)
+            handles.append(archive)
+        path = archive.extract(info, dst)
+        mode = info.external_attr >> 16
+        if mode:
+            os.chmod(path, mode & 0o777)
+            
+    try:
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            list(pool.map(extract, members))
+    finally:
+        for archive in handles:
+            archive.close()
+    return len(members)
+
+@functools.lru_cache(maxsize=8)
+def _disk_free_gb(mount):
+    """Free space on the filesystem mounted at mount, in GB (cached)"""
+    import shutil
+    
+    return shutil.disk_usage(mount).free / (1024**3)
+
+@functools.lru_cache(maxsize=None)
+def _tool_major_version(name):
+    """Major version reported by `<name> --version`, or None if not installed (cached)"""
+    import re
+    import shutil
+    import subprocess
+    
+    path = shutil.which(name)
+    if path is None:
+        return None
+    try:
+        out = subprocess.check_output([path, "--version"], text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r"(\d+)\.", out)
+    return int(match.group(1)) if match else None
+
+def _has_node(min_major=MIN_NODE_MAJOR):
+    """Whether a recent enough Node.js is already on PATH"""
+    version = _tool_major_version("node")
+    return version is not None and version >= min_major
+
+def _postgresql_server_major():
+    """Major version of the locally installed PostgreSQL server, or None if there is none"""
+    import glob
+    
+    candidates = ["postgres", "pg_ctl"]
+    # Debian/Ubuntu keep the server binaries off PATH, one directory per major version
+    candidates += glob.glob("/usr/lib/postgresql/*/bin/postgres")
+    versions = [v for v in map(_tool_major_version, candidates) if v is not None]
+    return max(versions, default=None)
+
+def _has_psql(db_host, min_major=MIN_POSTGRESQL_MAJOR):
+    """Whether a recent enough PostgreSQL is already installed for db_host
+    
+    A remote db_host only needs the psql client; a local one also needs the server.
+    """
+    version = _tool_major_version("psql")
+    if version is None or version < min_major:
+        return False
+    if db_host not in LOCAL_DB_HOSTS:
+        return True
+    server = _postgresql_server_major()
+    return server is not None and server >= min_major
+
+@dataclass(frozen=True)
+class InstallConfig:
+    """Installation settings, snapshotted once so they cannot change mid-install
+    
+    The field names double as the keys of a --cli settings file and as the
+    names of the wizard's Tk variables.
+    """
+    install_path: Path = Path(_DEFAULT_INSTALL)
+    db_host: str = "localhost"
+    db_port: str = "5432"
+    db_name: str = "ptc_election"
+    db_user: str = "postgres"
+    db_password: str = ""
+    admin_email: str = "admin@election.gov"
+    admin_password: str = "admin123"
+    server_port: str = "5000"
+    install_nodejs: bool = True
+    install_postgresql: bool = True
+    create_desktop_shortcut: bool = True
+    auto_start: bool = False
+    
+    def __post_init__(self):
+        # Settings files may spell ports and the like as JSON numbers
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if field.type is bool:
+                if not isinstance(value, bool):
+                    raise ValueError(f"{field.name} must be true or false, got {value!r}")
+            elif field.type is str:
+                if value is None or isinstance(value, (bool, list, dict)):
+                    raise ValueError(f"{field.name} must be a string, got {value!r}")
+                object.__setattr__(self, field.name, str(value))
+        if not isinstance(self.install_path, (str, os.PathLike)):
+            raise ValueError(f"install_path must be a string, got {self.install_path!r}")
+        if not str(self.install_path).strip():
+            # Path("") is the current directory, usually the installer itself
+            raise ValueError("install_path must not be empty")
+        object.__setattr__(self, "install_path", Path(self.install_path).expanduser())
+        
+    @property
+    def database_url(self):
+        """PostgreSQL connection string built from the database settings"""
+        from urllib.parse import quote
+        
+        # Credentials may contain URL delimiters such as @ : / # ?
+        user, password = quote(self.db_user, safe=""), quote(self.db_password, safe="")
+        return f"postgresql://{user}:{password}@{self.db_host}:{self.db_port}/{self.db_name}"
+
+class PTCInstallation:
+    """The installation steps, independent of any user interface
+    
+    log_progress and update_progress are called, possibly from worker threads,
+    with log lines and completion percentages. Each step receives the
+    InstallConfig it should apply. cancel() may be called from any thread.
+    """
+    def __init__(self, log_progress, update_progress):
+        self.log_progress = log_progress
+        self.update_progress = update_progress
+        self.cancelled = threading.Event()
+        self._processes = set()
+        self._processes_lock = threading.Lock()
+        
+    def cancel(self):
+        """Stop the installation
+        
+        No further steps start, commands started through run_command or
+        _run_streaming are terminated, and file copying/extraction stops at
+        the next file.
+        """
+        self.cancelled.set()
+        with self._processes_lock:
+            for proc in self._processes:
+                proc.terminate()
+                
+    def check_cancelled(self):
+        """Raise if cancel() has been called"""
+        if self.cancelled.is_set():
+            raise Exception("Installation cancelled")
+            
+    @contextlib.contextmanager
+    def _tracked(self, proc):
+        """Make proc visible to cancel() while the block runs"""
+        with self._processes_lock:
+            self._processes.add(proc)
+            # A cancel() that ran before registration could not see proc
+            if self.cancelled.is_set():
+                proc.terminate()
+        try:
+            yield proc
+        finally:
+            with self._processes_lock:
+                self._processes.discard(proc)
+        self.check_cancelled()
+            
+    def run(self, cfg):
+        """Run every installation step, raising on the first failure"""
+        self.log_progress("Starting PTC System Installation...")
+        self.update_progress(0)
+        
+        # Step 1: Create installation directory
+        self.log_progress(f"Creating installation directory: {cfg.install_path}")
+        cfg.install_path.mkdir(parents=True, exist_ok=True)
+        self.update_progress(10)
+        
+        # Step 2: Check system requirements
+        self.check_cancelled()
+        self.log_progress("Checking system requirements...")
+        self.check_system_requirements(cfg)
+        self.update_progress(20)
+        
+        # Steps 3-9: Independent steps run concurrently, each one
+        # starting as soon as the steps it depends on have finished. The two
+        # package-manager installs share apt/dpkg (or brew) locks and the sudo
+        # prompt, so PostgreSQL waits for Node.js; only the file copy overlaps them.
+        self.run_step_graph({
+            "nodejs": ("Installing Node.js...",
+                       self.install_nodejs_runtime if cfg.install_nodejs else None, ()),
+            "postgres": ("Installing PostgreSQL...",
+                         functools.partial(self.install_postgresql_db, cfg) if cfg.install_postgresql else None,
+                         ("nodejs",)),
+            "copy_files": ("Copying application files...", functools.partial(self.copy_application_files, cfg), ()),
+            "npm_install": ("Installing Node.js dependencies...", functools.partial(self.install_dependencies, cfg),
+                            ("nodejs", "copy_files")),
+            "db_configure": ("Configuring database...", functools.partial(self.configure_database, cfg),
+                             ("postgres", "npm_install")),
+            "env_config": ("Creating environment configuration...", functools.partial(self.create_environment_config, cfg),
+                           ("copy_files",)),
+            "services": ("Setting up system services...", functools.partial(self.setup_system_services, cfg),
+                         ("copy_files",)),
+        }, start=20, end=90)
+        
+        # Step 10: Final configuration
+        self.check_cancelled()
+        self.log_progress("Completing installation...")
+        self.complete_installation(cfg)
+        self.update_progress(100)
+        
+        self.log_progress("Installation completed successfully!")
+        self.log_progress(f"You can access the system at: http://localhost:{cfg.server_port}")
+        self.log_progress(f"Admin login: {cfg.admin_email}")
+        
+    def run_step_graph(self, steps, start, end):
+        """Run install steps concurrently, submitting each once its dependencies are done
+        
+        steps maps a step name to (message, function, dependencies); steps whose
+        function is None are disabled and count as already done.
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        
+        done = {name for name, (_, func, _) in steps.items() if func is None}
+        pending = {name: step for name, step in steps.items() if name not in done}
+        running = {}
+        
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            while pending or running:
+                for name, (message, func, deps) in list(pending.items()):
+                    if done.issuperset(deps) and not self.cancelled.is_set():
+                        del pending[name]
+                        self.log_progress(message)
+                        running[pool.submit(func)] = name
+                        
+                if not running:
+                    # Cancelled before the remaining steps could start
+                    break
+                future = next(as_completed(running))
+                done.add(running.pop(future))
+                try:
+                    future.result()
+                except BaseException:
+                    # Stop the sibling steps, or leaving the pool would wait for
+                    # them (e.g. a long package install) before reporting this
+                    self.cancel()
+                    raise
+                
+                percentage = start + (end - start) * len(done) / len(steps)
+                self.update_progress(percentage)
+                
+        self.check_cancelled()
+                
+    def check_system_requirements(self, cfg):
+        """Check if system meets minimum requirements"""
+        # Check Python version
+        python_version = sys.version_info
+        if python_version.major < 3 or (python_version.major == 3 and python_version.minor < 8):
+            raise Exception("Python 3.8 or higher is required")
+            
+        # Check available disk space
+        free_gb = _disk_free_gb(_mount_point(cfg.install_path))
+        if free_gb < 10:
+            raise Exception(f"Insufficient disk space. {free_gb:.1f}GB available, 10GB required")
+            
+        self.log_progress("System requirements check passed")
+        
+    def resolve_command(self, cmd):
+        """Resolve the executable of cmd to an absolute path with shutil.which
+        
+        A missing tool is reported by name before anything is spawned.
+        """
+        import shutil
+        
+        executable = shutil.which(cmd[0])
+        if executable is None:
+            raise Exception(f"Required command not found: {cmd[0]}")
+        return [executable, *cmd[1:]]
+        
+    def run_command(self, cmd, env=None):
+        """Run an external command, capturing its output as text, and return the completed process"""
+        import subprocess
+        
+        argv = self.resolve_command(cmd)
+        self.log_progress(f"Running: {' '.join(cmd)}")
+        proc = subprocess.Popen(argv, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        with self._tracked(proc), proc:
+            stdout, stderr = proc.communicate()
+        return subprocess.CompletedProcess(argv, proc.returncode, stdout, stderr)
+        
+    def _run_streaming(self, cmd, cwd=None, env=None):
+        """Run an external command, forwarding its output to the progress log line by line"""
+        import subprocess
+        
+        argv = self.resolve_command(cmd)
+        self.log_progress(f"Running: {' '.join(cmd)}")
+        proc = subprocess.Popen(argv, cwd=cwd, env=env,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                bufsize=1, text=True)
+        with self._tracked(proc), proc:
+            for line in iter(proc.stdout.readline, ''):
+                self.log_progress(line.rstrip())
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+            
+    def _install_system_package(self, name, commands):
+        """Install name with this platform's package manager command from commands
+        
+        Output is piped into the log, so nothing can answer a sudo password
+        prompt: without root, sudo must already be authorised (sudo -n).
+        """
+        cmd = commands.get(_SYSTEM)
+        if cmd is None:
+            raise Exception(f"Automatic {name} installation is not supported on {_SYSTEM}")
+        import shutil
+        
+        prefix = []
+        if _SYSTEM in PRIVILEGED_SYSTEMS and os.geteuid() != 0:
+            prefix = ["sudo", "-n"]
+            if shutil.which("sudo") is None or self.run_command(prefix + ["true"]).returncode != 0:
+                raise Exception(f"Installing {name} needs root: run the installer as root, "
+                                f"pre-authorise sudo with 'sudo -v', or install {name} manually")
+        update = PACKAGE_INDEX_UPDATE_COMMANDS.get(_SYSTEM)
+        if update is not None:
+            self._run_streaming(prefix + update)
+        self._run_streaming(prefix + cmd)
+        # The new binaries must be probed afresh, not answered from the cache
+        _tool_major_version.cache_clear()
+        
+    def install_nodejs_runtime(self):
+        """Install Node.js runtime"""
+        if _has_node():
+            self.log_progress(f"Node.js {_tool_major_version('node')} already installed, skipping")
+            return
+        self._install_system_package("Node.js", NODEJS_INSTALL_COMMANDS)
+        if not _has_node():
+            found = _tool_major_version("node")
+            raise Exception(f"Node.js {MIN_NODE_MAJOR}+ is required, but after installing "
+                            f"{'version ' + str(found) if found else 'nothing'} is on PATH; "
+                            f"install a newer Node.js manually and re-run the installer")
+        
+    def install_postgresql_db(self, cfg):
+        """Install PostgreSQL database"""
+        if _has_psql(cfg.db_host):
+            if cfg.db_host in LOCAL_DB_HOSTS:
+                self.log_progress(f"PostgreSQL server {_postgresql_server_major()} already installed, skipping")
+            else:
+                self.log_progress(f"PostgreSQL client {_tool_major_version('psql')} already installed "
+                                  f"for remote host {cfg.db_host}, skipping")
+            return
+        self._install_system_package("PostgreSQL", POSTGRESQL_INSTALL_COMMANDS)
+        if not _has_psql(cfg.db_host):
+            raise Exception(f"PostgreSQL {MIN_POSTGRESQL_MAJOR}+ is required, but the package manager "
+                            f"did not provide it; install a newer PostgreSQL manually and re-run the installer")
+        
+    def copy_application_files(self, cfg):
+        """Copy application files to installation directory"""
+        if APP_BUNDLE.exists():
+            self.log_progress(f"Extracting {APP_BUNDLE} -> {cfg.install_path}")
+            count = _extract_bundle(APP_BUNDLE, cfg.install_path, self.check_cancelled)
+            self.log_progress(f"Extracted {count} files")
+            return
+            
+        self.log_progress(f"Copying {SOURCE_DIR} -> {cfg.install_path}")
+        dirs, files = [], []
+        for name in COPY_INCLUDE:
+            src = SOURCE_DIR / name
+            if src.is_dir():
+                sub_dirs, sub_files = _scan_tree(src)
+                dirs += [name] + [os.path.join(name, rel) for rel in sub_dirs]
+                files += [os.path.join(name, rel) for rel in sub_files]
+            elif src.exists():
+                files.append(name)
+        
+        # Parents sort before their children, so one mkdir per directory suffices
+        for rel in sorted(dirs):
+            (cfg.install_path / rel).mkdir(exist_ok=True)
+        for rel in files:
+            self.check_cancelled()
+            _copy_file(SOURCE_DIR / rel, cfg.install_path / rel)
+        self.log_progress(f"Copied {len(files)} files in {len(dirs)} directories")
+        
+        # Uploaded documents belong to each installation; start with none
+        (cfg.install_path / "uploads").mkdir(exist_ok=True)
+        
+    def install_dependencies(self, cfg):
+        """Install Node.js dependencies"""
+        cmd = ["npm", "ci", "--prefer-offline", "--no-audit", "--no-fund"]
+        self._run_streaming(cmd, cwd=cfg.install_path)
+        
+    def configure_database(self, cfg):
+        """Configure the database"""
+        env = dict(os.environ, PGPASSWORD=cfg.db_password)
+        
+        self.log_progress("Creating database schema...")
+        result = self.run_command(["createdb", "-h", cfg.db_host, "-p", cfg.db_port,
+                                   "-U", cfg.db_user, cfg.db_name],
+                                  env=env)
+        if result.returncode != 0:
+            if "already exists" not in result.stderr:
+                raise Exception(f"Could not create database: {result.stderr.strip()}")
+            self.log_progress(f"Database {cfg.db_name} already exists")
+            
+        self.log_progress("Running database migrations...")
+        env["DATABASE_URL"] = cfg.database_url
+        self._run_streaming(["npm", "run", "db:push"], cwd=cfg.install_path, env=env)
+        self.log_progress("Initial data will be seeded on first server start")
+        
+    def create_environment_config(self, cfg):
+        """Create environment configuration file"""
+        config = {
+            "DATABASE_URL": cfg.database_url,
+            "SESSION_SECRET": secrets.token_urlsafe(48),
+            "NODE_ENV": "production",
+            "PORT": cfg.server_port
+        }
+        
+        config_path = cfg.install_path / ".env"
+        self.log_progress(f"Creating configuration file: {config_path}")
+        
+        # Written in dotenv format to a private temp file, then renamed over the
+        # target so readers never see a partially written file. mkstemp creates
+        # a fresh 0600 file, so a stale or symlinked temp file cannot leak its
+        # mode or target into .env
+        import tempfile
+        
+        payload = ("\n".join(f"{key}={value}" for key, value in config.items()) + "\n").encode()
+        fd, tmp_path = tempfile.mkstemp(prefix=".env.", suffix=".tmp", dir=cfg.install_path)
+        try:
+            try:
+                view = memoryview(payload)
+                while view:
+                    view = view[os.write(fd, view):]
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, config_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+        
+    def setup_system_services(self, cfg):
+        """Set up system services"""
+        if cfg.auto_start:
+            self.log_progress("Setting up auto-start service...")
+            
+        if cfg.create_desktop_shortcut:
+            self.log_progress("Creating desktop shortcut...")
+            
+    def complete_installation(self, cfg):
+        """Complete the installation"""
+        self.log_progress("Setting file permissions...")
+        uploads = cfg.install_path / "uploads"
+        uploads.mkdir(exist_ok=True)
+        # mkdir's mode is ignored for an existing directory, and umask applies to it
+        os.chmod(uploads, 0o750)
+        
+        self.log_progress("Validating installation...")
+        for required in ("package.json", "node_modules"):
+            if not (cfg.install_path / required).exists():
+                raise Exception(f"Installation is incomplete: {required} is missing")
+
+# Form descriptors: (label, variable name, entry width or None to stretch)
+FIELDS_DB = [
+    ("Host:", "db_host", None),
+    ("Port:", "db_port", 10),
+    ("Database Name:", "db_name", None),
+    ("Username:", "db_user", None),
+    ("Password:", "db_password", None),
+]
+FIELDS_ADMIN = [
+    ("Admin Email:", "admin_email", None),
+    ("Admin Password:", "admin_password", None),
+]
+FIELDS_SERVER = [
+    ("Server Port:", "server_port", 10),
+]
+
+# Progress log batching: flush interval (ms) and widget size bounds (lines)
+LOG_FLUSH_MS = 100
+LOG_MAX_LINES = 5000
+LOG_TRIM_LINES = 1000
+
+# Installation summary layout: (text preceding the value, variable name)
+SUMMARY_LAYOUT = [
+    ("Installation Configuration Summary:\n\nInstallation Path: ", "install_path"),
+    ("\nDatabase Host: ", "db_host"),
+    (":", "db_port"),
+    ("\nDatabase Name: ", "db_name"),
+    ("\nDatabase User: ", "db_user"),
+    ("\nAdmin Email: ", "admin_email"),
+    ("\nServer Port: ", "server_port"),
+    ("\n\nComponents to Install:\n- Node.js Runtime: ", "install_nodejs"),
+    ("\n- PostgreSQL Database: ", "install_postgresql"),
+    ("\n- Desktop Shortcut: ", "create_desktop_shortcut"),
+    ("\n- Auto-start Service: ", "auto_start"),
+]
+
 class PTCInstaller:
     def __init__(self):
         self.root = tk.Tk()
@@ -24,26 +659,29 @@ class PTCInstaller:
         self.root.geometry("800x600")
         self.root.resizable(True, True)
         
-        # Configuration variables
-        self.install_path = tk.StringVar(value=os.path.expanduser("~/ptc-system"))
-        self.db_host = tk.StringVar(value="localhost")
-        self.db_port = tk.StringVar(value="5432")
-        self.db_name = tk.StringVar(value="ptc_election")
-        self.db_user = tk.StringVar(value="postgres")
-        self.db_password = tk.StringVar()
-        self.admin_email = tk.StringVar(value="admin@election.gov")
-        self.admin_password = tk.StringVar(value="admin123")
-        self.server_port = tk.StringVar(value="5000")
-        
-        # Installation options
-        self.install_nodejs = tk.BooleanVar(value=True)
-        self.install_postgresql = tk.BooleanVar(value=True)
-        self.create_desktop_shortcut = tk.BooleanVar(value=True)
-        self.auto_start = tk.BooleanVar(value=False)
+        # Configuration variables and installation options, one per setting
+        for field in fields(InstallConfig):
+            if field.type is bool:
+                setattr(self, field.name, tk.BooleanVar(value=field.default))
+            else:
+                setattr(self, field.name, tk.StringVar(value=str(field.default)))
+        
+        # Installation jobs run one at a time on a single persistent worker
+        self._jobs = queue.Queue()
+        self._installation = None
+        threading.Thread(target=self._worker_loop, daemon=True).start()
+        
+        # Progress log lines waiting for the next batched flush
+        self._log_queue = collections.deque()
+        self._flush_scheduled = False
         
         self.setup_ui()
         
     def setup_ui(self):
+        # Keep the window unmapped while it is populated so geometry is
+        # computed once, not after every widget is packed
+        self.root.withdraw()
+        
         # Create notebook for tabs
         notebook = ttk.Notebook(self.root)
         notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -66,6 +704,8 @@ class PTCInstaller:
         # Create bottom frame for navigation buttons
         self.create_navigation_buttons()
         
+        self.root.deiconify()
+        
     def create_welcome_tab(self, notebook):
         welcome_frame = ttk.Frame(notebook)
         notebook.add(welcome_frame, text="Welcome")
@@ -105,9 +745,7 @@ class PTCInstaller:
             "✓ Real-time WebSocket updates"
         ]
         
-        for feature in features:
-            feature_label = tk.Label(features_frame, text=feature, font=("Arial", 10), anchor=tk.W)
-            feature_label.pack(anchor=tk.W, pady=2)
+        self.create_text_list(features_frame, features, font=("Arial", 10), spacing=2)
         
         # System requirements
         req_frame = tk.Frame(welcome_frame)
@@ -119,17 +757,26 @@ class PTCInstaller:
         req_title.pack(anchor=tk.W)
         
         requirements = [
-            f"• Operating System: {platform.system()} {platform.release()}",
-            "• Node.js 18+ (will be installed if not present)",
-            "• PostgreSQL 13+ (will be installed if not present)",
+            f"• Operating System: {_SYSTEM} {_RELEASE}",
+            f"• Node.js {MIN_NODE_MAJOR}+ (will be installed if not present)",
+            f"• PostgreSQL {MIN_POSTGRESQL_MAJOR}+ (will be installed if not present)",
             "• 4GB RAM minimum, 8GB recommended",
             "• 10GB free disk space"
         ]
         
-        for req in requirements:
-            req_label = tk.Label(req_frame, text=req, font=("Arial", 9))
-            req_label.pack(anchor=tk.W, pady=1)
-            
+        self.create_text_list(req_frame, requirements, font=("Arial", 9), spacing=1)
+        
+    def create_text_list(self, parent, items, font, spacing):
+        """Show static lines in one read-only Text widget instead of a Label per line"""
+        text = tk.Text(parent, height=len(items), font=font, wrap=tk.WORD,
+                       spacing1=spacing, spacing3=spacing,
+                       relief=tk.FLAT, borderwidth=0, highlightthickness=0,
+                       background=parent.cget("background"), cursor="arrow")
+        text.insert("1.0", "\n".join(items))
+        text.config(state=tk.DISABLED)
+        text.pack(anchor=tk.W, fill=tk.X)
+        return text
+        
     def create_options_tab(self, notebook):
         options_frame = ttk.Frame(notebook)
         notebook.add(options_frame, text="Installation Options")
@@ -166,25 +813,24 @@ class PTCInstaller:
         conn_frame.pack(fill=tk.X, padx=20, pady=10)
         
         # Grid layout for database fields
-        tk.Label(conn_frame, text="Host:").grid(row=0, column=0, sticky=tk.W, pady=5)
-        tk.Entry(conn_frame, textvariable=self.db_host).grid(row=0, column=1, sticky=tk.EW, padx=(10, 0), pady=5)
-        
-        tk.Label(conn_frame, text="Port:").grid(row=0, column=2, sticky=tk.W, padx=(20, 0), pady=5)
-        tk.Entry(conn_frame, textvariable=self.db_port, width=10).grid(row=0, column=3, sticky=tk.EW, padx=(10, 0), pady=5)
-        
-        tk.Label(conn_frame, text="Database Name:").grid(row=1, column=0, sticky=tk.W, pady=5)
-        tk.Entry(conn_frame, textvariable=self.db_name).grid(row=1, column=1, sticky=tk.EW, padx=(10, 0), pady=5)
-        
-        tk.Label(conn_frame, text="Username:").grid(row=2, column=0, sticky=tk.W, pady=5)
-        tk.Entry(conn_frame, textvariable=self.db_user).grid(row=2, column=1, sticky=tk.EW, padx=(10, 0), pady=5)
-        
-        tk.Label(conn_frame, text="Password:").grid(row=3, column=0, sticky=tk.W, pady=5)
-        tk.Entry(conn_frame, textvariable=self.db_password, show="*").grid(row=3, column=1, sticky=tk.EW, padx=(10, 0), pady=5)
+        self._add_fields(conn_frame, FIELDS_DB)
         
         conn_frame.columnconfigure(1, weight=1)
         
         # Test connection button
-        tk.Button(conn_frame, text="Test Connection", command=self.test_db_connection).grid(row=4, column=1, pady=10)
+        tk.Button(conn_frame, text="Test Connection", command=self.test_db_connection).grid(row=len(FIELDS_DB), column=1, pady=10)
+        
+    def _add_fields(self, frame, descriptor):
+        """Grid a (label, variable name, width) form descriptor into frame, one row each"""
+        for row, (label, attr, width) in enumerate(descriptor):
+            self._add_field(frame, row, label, getattr(self, attr), width,
+                            show="*" if attr.endswith("password") else None)
+            
+    def _add_field(self, frame, row, label, var, width, show=None):
+        """Add a labelled entry; entries with an explicit width keep it instead of stretching"""
+        tk.Label(frame, text=label).grid(row=row, column=0, sticky=tk.W, pady=5)
+        tk.Entry(frame, textvariable=var, width=width, show=show).grid(
+            row=row, column=1, sticky=tk.EW if width is None else tk.W, padx=(10, 0), pady=5)
         
     def create_system_tab(self, notebook):
         system_frame = ttk.Frame(notebook)
@@ -194,11 +840,7 @@ class PTCInstaller:
         admin_frame = tk.LabelFrame(system_frame, text="Administrator Account", padx=10, pady=10)
         admin_frame.pack(fill=tk.X, padx=20, pady=10)
         
-        tk.Label(admin_frame, text="Admin Email:").grid(row=0, column=0, sticky=tk.W, pady=5)
-        tk.Entry(admin_frame, textvariable=self.admin_email, width=30).grid(row=0, column=1, sticky=tk.EW, padx=(10, 0), pady=5)
-        
-        tk.Label(admin_frame, text="Admin Password:").grid(row=1, column=0, sticky=tk.W, pady=5)
-        tk.Entry(admin_frame, textvariable=self.admin_password, show="*", width=30).grid(row=1, column=1, sticky=tk.EW, padx=(10, 0), pady=5)
+        self._add_fields(admin_frame, FIELDS_ADMIN)
         
         admin_frame.columnconfigure(1, weight=1)
         
@@ -206,8 +848,7 @@ class PTCInstaller:
         server_frame = tk.LabelFrame(system_frame, text="Server Configuration", padx=10, pady=10)
         server_frame.pack(fill=tk.X, padx=20, pady=10)
         
-        tk.Label(server_frame, text="Server Port:").grid(row=0, column=0, sticky=tk.W, pady=5)
-        tk.Entry(server_frame, textvariable=self.server_port, width=10).grid(row=0, column=1, sticky=tk.W, padx=(10, 0), pady=5)
+        self._add_fields(server_frame, FIELDS_SERVER)
         
         server_frame.columnconfigure(1, weight=1)
         
@@ -222,7 +863,7 @@ class PTCInstaller:
         self.summary_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        self.update_summary()
+        self.build_summary()
         
     def create_progress_tab(self, notebook):
         progress_frame = ttk.Frame(notebook)
@@ -252,6 +893,12 @@ class PTCInstaller:
                                        padx=20, pady=5)
         self.install_button.pack(side=tk.RIGHT, padx=(5, 0))
         
+        self.cancel_button = tk.Button(button_frame, text="Cancel",
+                                      command=self.cancel_installation,
+                                      state=tk.DISABLED,
+                                      padx=20, pady=5)
+        self.cancel_button.pack(side=tk.RIGHT, padx=(5, 0))
+        
         tk.Button(button_frame, text="Exit", 
                  command=self.root.quit,
                  padx=20, pady=5).pack(side=tk.RIGHT)
@@ -260,47 +907,134 @@ class PTCInstaller:
         path = filedialog.askdirectory(initialdir=self.install_path.get())
         if path:
             self.install_path.set(path)
-            self.update_summary()
             
     def test_db_connection(self):
-        # Simulate database connection test
-        messagebox.showinfo("Database Test", "Database connection test will be implemented during installation.")
+        """Probe the database server without blocking the UI"""
+        host, port = self.db_host.get(), self.db_port.get()
+        self._async(lambda: self._probe_db(host, port), self._show_db_result)
+        
+    def _async(self, fn, on_done):
+        """Run fn on a daemon thread and pass its result to on_done on the Tk thread"""
+        def worker():
+            result = fn()
+            self.root.after(0, on_done, result)
+            
+        threading.Thread(target=worker, daemon=True).start()
         
-    def update_summary(self):
-        summary = f"""Installation Configuration Summary:
-
-Installation Path: {self.install_path.get()}
-Database Host: {self.db_host.get()}:{self.db_port.get()}
-Database Name: {self.db_name.get()}
-Database User: {self.db_user.get()}
-Admin Email: {self.admin_email.get()}
-Server Port: {self.server_port.get()}
-
-Components to Install:
-- Node.js Runtime: {'Yes' if self.install_nodejs.get() else 'No'}
-- PostgreSQL Database: {'Yes' if self.install_postgresql.get() else 'No'}
-- Desktop Shortcut: {'Yes' if self.create_desktop_shortcut.get() else 'No'}
-- Auto-start Service: {'Yes' if self.auto_start.get() else 'No'}
-"""
+    def _probe_db(self, host, port):
+        """Open a TCP connection to the database server, returning (ok, message)"""
+        import socket
         
-        if hasattr(self, 'summary_text'):
-            self.summary_text.delete(1.0, tk.END)
-            self.summary_text.insert(tk.END, summary)
+        try:
+            with socket.create_connection((host, int(port)), timeout=1.5):
+                return True, f"Database server at {host}:{port} is reachable."
+        except ValueError:
+            return False, f"Invalid database port: {port}"
+        except OSError as e:
+            return False, f"Could not reach {host}:{port}: {e}"
+            
+    def _show_db_result(self, result):
+        """Report the outcome of a database probe"""
+        ok, message = result
+        if ok:
+            messagebox.showinfo("Database Test", message)
+        else:
+            messagebox.showerror("Database Test", message)
+        
+    def build_summary(self):
+        """Fill the summary once, bracketing each value with named marks
+        
+        Each value sits between "<name>_start" (left gravity) and "<name>_end"
+        (right gravity) marks, so a variable change only replaces its own text.
+        """
+        for text, name in SUMMARY_LAYOUT:
+            self.summary_text.insert(tk.END, text)
+            self.summary_text.mark_set(f"{name}_start", "end-1c")
+            self.summary_text.mark_gravity(f"{name}_start", tk.LEFT)
+            self.summary_text.insert(tk.END, self.summary_value(name))
+            # Left gravity while building so later inserts don't drag the mark along
+            self.summary_text.mark_set(f"{name}_end", "end-1c")
+            self.summary_text.mark_gravity(f"{name}_end", tk.LEFT)
+        self.summary_text.insert(tk.END, "\n")
+        
+        for _, name in SUMMARY_LAYOUT:
+            self.summary_text.mark_gravity(f"{name}_end", tk.RIGHT)
+            getattr(self, name).trace_add(
+                "write", lambda *args, name=name: self._set_summary_field(name, self.summary_value(name)))
+            
+    def summary_value(self, name):
+        """Format a configuration variable for the summary"""
+        value = getattr(self, name).get()
+        if isinstance(value, bool):
+            return "Yes" if value else "No"
+        return value
+        
+    def _set_summary_field(self, name, value):
+        """Replace a single value in the summary"""
+        self.summary_text.replace(f"{name}_start", f"{name}_end", value)
             
     def log_progress(self, message):
-        """Add a message to the progress log"""
-        self.progress_text.insert(tk.END, f"[{time.strftime('%H:%M:%S')}] {message}\n")
+        """Queue a message for the progress log; safe to call from any thread"""
+        self._log_queue.append(f"[{time.strftime('%H:%M:%S')}] {message}\n")
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.root.after(LOG_FLUSH_MS, self._flush_log)
+            
+    def _flush_log(self):
+        """Write every queued log line to the progress widget in a single insert"""
+        self._flush_scheduled = False
+        batch = []
+        while self._log_queue:
+            batch.append(self._log_queue.popleft())
+        if not batch:
+            return
+            
+        self.progress_text.insert(tk.END, "".join(batch))
+        # Bound the widget's memory on long installs by dropping the oldest lines
+        line_count = int(self.progress_text.index("end-1c").split(".")[0])
+        if line_count > LOG_MAX_LINES:
+            self.progress_text.delete("1.0", f"{LOG_TRIM_LINES + 1}.0")
         self.progress_text.see(tk.END)
-        self.root.update()
         
     def update_progress(self, percentage):
-        """Update the progress bar"""
+        """Update the progress bar; Tk thread only, workers go through root.after"""
         self.progress_var.set(percentage)
-        self.root.update()
+        self.root.update_idletasks()
+        
+    def reset_install_button(self):
+        """Re-enable the install button after an installation attempt"""
+        self.install_button.config(state=tk.NORMAL, text="Start Installation")
+        self.cancel_button.config(state=tk.DISABLED)
+        self._installation = None
+        
+    def _worker_loop(self):
+        """Run queued jobs in order; the only thread that ever runs an installation"""
+        while True:
+            job = self._jobs.get()
+            job()
+            
+    def cancel_installation(self):
+        """Abort the running installation"""
+        installation = self._installation
+        if installation is not None:
+            self.log_progress("Cancelling installation...")
+            self.cancel_button.config(state=tk.DISABLED)
+            installation.cancel()
         
     def start_installation(self):
         """Start the installation process"""
+        try:
+            cfg = InstallConfig(**{field.name: getattr(self, field.name).get() for field in fields(InstallConfig)})
+        except ValueError as e:
+            messagebox.showerror("Invalid Settings", str(e))
+            return
+            
         self.install_button.config(state=tk.DISABLED, text="Installing...")
+        self.cancel_button.config(state=tk.NORMAL)
+        
+        # A retry must see current disk usage and tool versions, not the previous attempt's
+        _disk_free_gb.cache_clear()
+        _tool_major_version.cache_clear()
         
         # Switch to progress tab
         for child in self.root.winfo_children():
@@ -308,167 +1042,83 @@ Components to Install:
                 child.select(4)  # Progress tab
                 break
                 
-        # Start installation in a separate thread
-        installation_thread = threading.Thread(target=self.run_installation)
-        installation_thread.daemon = True
-        installation_thread.start()
+        # Created here on the Tk thread so Cancel always has a target, then
+        # handed to the worker thread
+        self._installation = PTCInstallation(
+            self.log_progress, lambda percentage: self.root.after(0, self.update_progress, percentage))
+        self._jobs.put(functools.partial(self.run_installation, self._installation, cfg))
         
-    def run_installation(self):
+    def run_installation(self, installation, cfg):
         """Run the actual installation process"""
         try:
-            self.log_progress("Starting PTC System Installation...")
-            self.update_progress(0)
-            
-            # Step 1: Create installation directory
-            self.log_progress(f"Creating installation directory: {self.install_path.get()}")
-            os.makedirs(self.install_path.get(), exist_ok=True)
-            self.update_progress(10)
-            
-            # Step 2: Check system requirements
-            self.log_progress("Checking system requirements...")
-            self.check_system_requirements()
-            self.update_progress(20)
-            
-            # Step 3: Install Node.js if needed
-            if self.install_nodejs.get():
-                self.log_progress("Installing Node.js...")
-                self.install_nodejs_runtime()
-            self.update_progress(30)
-            
-            # Step 4: Install PostgreSQL if needed
-            if self.install_postgresql.get():
-                self.log_progress("Installing PostgreSQL...")
-                self.install_postgresql_db()
-            self.update_progress(40)
-            
-            # Step 5: Copy application files
-            self.log_progress("Copying application files...")
-            self.copy_application_files()
-            self.update_progress(50)
-            
-            # Step 6: Install dependencies
-            self.log_progress("Installing Node.js dependencies...")
-            self.install_dependencies()
-            self.update_progress(60)
-            
-            # Step 7: Configure database
-            self.log_progress("Configuring database...")
-            self.configure_database()
-            self.update_progress(70)
-            
-            # Step 8: Create environment configuration
-            self.log_progress("Creating environment configuration...")
-            self.create_environment_config()
-            self.update_progress(80)
-            
-            # Step 9: Set up system services
-            self.log_progress("Setting up system services...")
-            self.setup_system_services()
-            self.update_progress(90)
-            
-            # Step 10: Final configuration
-            self.log_progress("Completing installation...")
-            self.complete_installation()
-            self.update_progress(100)
-            
-            self.log_progress("Installation completed successfully!")
-            self.log_progress(f"You can access the system at: http://localhost:{self.server_port.get()}")
-            self.log_progress(f"Admin login: {self.admin_email.get()}")
-            
-            messagebox.showinfo("Installation Complete", 
-                              f"PTC System has been installed successfully!\n\n"
-                              f"Access URL: http://localhost:{self.server_port.get()}\n"
-                              f"Admin Email: {self.admin_email.get()}\n"
-                              f"Installation Path: {self.install_path.get()}")
+            installation.run(cfg)
+            self.root.after(0, messagebox.showinfo, "Installation Complete",
+                            f"PTC System has been installed successfully!\n\n"
+                            f"Access URL: http://localhost:{cfg.server_port}\n"
+                            f"Admin Email: {cfg.admin_email}\n"
+                            f"Installation Path: {cfg.install_path}")
                               
         except Exception as e:
             self.log_progress(f"Installation failed: {str(e)}")
-            messagebox.showerror("Installation Error", f"Installation failed: {str(e)}")
+            self.root.after(0, messagebox.showerror, "Installation Error", f"Installation failed: {str(e)}")
         finally:
-            self.install_button.config(state=tk.NORMAL, text="Start Installation")
-            
-    def check_system_requirements(self):
-        """Check if system meets minimum requirements"""
-        # Check Python version
-        python_version = sys.version_info
-        if python_version.major < 3 or (python_version.major == 3 and python_version.minor < 7):
-            raise Exception("Python 3.7 or higher is required")
-            
-        # Check available disk space
-        import shutil
-        total, used, free = shutil.disk_usage(self.install_path.get())
-        free_gb = free / (1024**3)
-        if free_gb < 10:
-            raise Exception(f"Insufficient disk space. {free_gb:.1f}GB available, 10GB required")
+            self.root.after(0, self.reset_install_button)
             
-        self.log_progress("System requirements check passed")
-        
-    def install_nodejs_runtime(self):
-        """Install Node.js runtime"""
-        self.log_progress("Node.js installation simulated (would download and install Node.js 20+)")
-        time.sleep(1)  # Simulate installation time
-        
-    def install_postgresql_db(self):
-        """Install PostgreSQL database"""
-        self.log_progress("PostgreSQL installation simulated (would download and install PostgreSQL 15+)")
-        time.sleep(1)  # Simulate installation time
-        
-    def copy_application_files(self):
-        """Copy application files to installation directory"""
-        self.log_progress("Application files would be extracted from package")
-        time.sleep(1)  # Simulate copy time
-        
-    def install_dependencies(self):
-        """Install Node.js dependencies"""
-        self.log_progress("Running: npm install")
-        time.sleep(2)  # Simulate npm install time
-        
-    def configure_database(self):
-        """Configure the database"""
-        self.log_progress("Creating database schema...")
-        self.log_progress("Running database migrations...")
-        self.log_progress("Seeding initial data...")
-        time.sleep(1)
-        
-    def create_environment_config(self):
-        """Create environment configuration file"""
-        config = {
-            "DATABASE_URL": f"postgresql://{self.db_user.get()}:{self.db_password.get()}@{self.db_host.get()}:{self.db_port.get()}/{self.db_name.get()}",
-            "SESSION_SECRET": "generated-secure-session-secret",
-            "NODE_ENV": "production",
-            "PORT": self.server_port.get()
-        }
-        
-        config_path = os.path.join(self.install_path.get(), ".env")
-        self.log_progress(f"Creating configuration file: {config_path}")
-        
-    def setup_system_services(self):
-        """Set up system services"""
-        if self.auto_start.get():
-            self.log_progress("Setting up auto-start service...")
-            
-        if self.create_desktop_shortcut.get():
-            self.log_progress("Creating desktop shortcut...")
-            
-    def complete_installation(self):
-        """Complete the installation"""
-        self.log_progress("Setting file permissions...")
-        self.log_progress("Validating installation...")
-        time.sleep(1)
+def run_cli(argv):
+    """Install without the GUI, taking settings from an optional JSON file"""
+    import json
+    
+    overrides = {}
+    if argv:
+        try:
+            with open(argv[0]) as f:
+                overrides = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not read settings from {argv[0]}: {e}", file=sys.stderr)
+            return 2
+        if not isinstance(overrides, dict):
+            print(f"Settings in {argv[0]} must be a JSON object", file=sys.stderr)
+            return 2
+        unknown = set(overrides) - {field.name for field in fields(InstallConfig)}
+        if unknown:
+            print(f"Unknown settings in {argv[0]}: {', '.join(sorted(unknown))}", file=sys.stderr)
+            return 2
+    try:
+        cfg = InstallConfig(**overrides)
+    except ValueError as e:
+        print(f"Invalid settings in {argv[0]}: {e}", file=sys.stderr)
+        return 2
+        
+    print("PTC System - Command Line Installation")
+    installation = PTCInstallation(
+        lambda message: print(f"[{time.strftime('%H:%M:%S')}] {message}", flush=True),
+        lambda percentage: None)
+    try:
+        installation.run(cfg)
+    except Exception as e:
+        print(f"Installation failed: {e}")
+        return 1
+    return 0
 
-def main():
-    """Main function to run the installer"""
-    if len(sys.argv) > 1 and sys.argv[1] == "--cli":
-        print("PTC System - Command Line Installation")
-        print("For GUI installation, run without --cli parameter")
-        return
-        
+def run_gui():
+    """Launch the graphical installer"""
+    global tk, ttk, messagebox, filedialog
+    import tkinter as tk
+    from tkinter import ttk, messagebox, filedialog
+    
     try:
         installer = PTCInstaller()
         installer.root.mainloop()
     except Exception as e:
         print(f"Failed to start installer: {e}")
-        sys.exit(1)
+        return 1
+    return 0
+
+def main():
+    """Main function to run the installer"""
+    if sys.argv[1:2] == ["--cli"]:
+        sys.exit(run_cli(sys.argv[2:]))
+    sys.exit(run_gui())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()